@@ -15,14 +15,17 @@ from .parameters import Param
 from .patient import Patient
 from .restrictattributes import RestrictAttributes, RestrictAttributesMeta
 from .runner import Runner
+from .samplers import BufferedSampler, DiscreteSampler
 
 __all__ = [
+    "BufferedSampler",
+    "DiscreteSampler",
     "LockedDict",
-    "SimLogger",
     "Model",
     "Param",
     "Patient",
     "RestrictAttributes",
     "RestrictAttributesMeta",
-    "Runner"
+    "Runner",
+    "SimLogger"
 ]
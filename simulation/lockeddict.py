@@ -4,6 +4,58 @@ initialisation.
 """
 
 from collections import UserDict
+import sys
+
+
+class LockedKeyError(KeyError):
+    """
+    Error raised on an attempt to add a new top-level key to a LockedDict.
+
+    The message, which lists the allowed keys, is only built when the error
+    is displayed, rather than when it is raised.
+
+    Attributes
+    ----------
+    key : any
+        The key that could not be added.
+    locked_keys : frozenset
+        The allowed top-level keys.
+    """
+    def __init__(self, key, locked_keys):
+        """
+        Parameters
+        ----------
+        key : any
+            The key that could not be added.
+        locked_keys : frozenset
+            The allowed top-level keys.
+        """
+        super().__init__(key, locked_keys)
+        self.key = key
+        self.locked_keys = locked_keys
+
+    def __str__(self):
+        return (
+            f"Attempted to add or update key '{self.key}', which is not "
+            f"one of the original locked keys. This is likely due to "
+            f"a typo or unintended new parameter. Allowed top-level "
+            f"keys are: {sorted(map(str, self.locked_keys))}"
+        )
+
+
+class LockedKeyDeletionError(LockedKeyError):
+    """
+    Error raised on an attempt to delete a top-level key from a LockedDict.
+
+    As for LockedKeyError, the message is only built when displayed.
+    """
+    def __str__(self):
+        return (
+            f"Deletion of key '{self.key}' is not allowed. The set of "
+            f"top-level keys is locked to prevent accidental removal of "
+            f"expected parameters. Allowed top-level keys are: "
+            f"{sorted(map(str, self.locked_keys))}"
+        )
 
 
 class LockedDict(UserDict):
@@ -16,11 +68,11 @@ class LockedDict(UserDict):
 
     Attributes
     ----------
-    _locked_keys : set
-        The set of top-level keys locked after initialisation.
-    _locked_keys_initialised : bool
-        Indicates whether locked key enforcement is active (True after
-        __init__ completes). This flag is crucial for compatibility with
+    _locked_keys : frozenset or None
+        The set of top-level keys locked after initialisation. String keys
+        are interned; other keys are stored as given. This is None (or not
+        yet set) until __init__ completes, which indicates that locked key
+        enforcement is not yet active. This is crucial for compatibility with
         joblib and multiprocessing, as object reconstruction during
         deserialisation may call __setitem__ before additional attributes are
         restored.
@@ -38,10 +90,10 @@ class LockedDict(UserDict):
         Notes
         -----
         """
-        self._locked_keys_initialised = False
+        self._locked_keys = None
         super().__init__(*args, **kwargs)
-        self._locked_keys = set(self.data)
-        self._locked_keys_initialised = True
+        # Keys were interned by __setitem__ as they were added
+        self._locked_keys = frozenset(self.data)
 
     def __setattr__(self, name, value):
         """
@@ -72,8 +124,9 @@ class LockedDict(UserDict):
 
         Raises
         ------
-        KeyError
-            If key is not an original top-level key.
+        LockedKeyError
+            If key is not an original top-level key (a subclass of
+            KeyError).
 
         Notes
         -----
@@ -81,14 +134,16 @@ class LockedDict(UserDict):
         when used with joblib or multiprocessing, which may call __setitem__
         before all attributes are available.
         """
-        if getattr(self, '_locked_keys_initialised', False):
-            if key not in self._locked_keys:
-                raise KeyError(
-                    f"Attempted to add or update key '{key}', which is not "
-                    f"one of the original locked keys. This is likely due to "
-                    f"a typo or unintended new parameter. Allowed top-level "
-                    f"keys are: [{self._locked_keys}]"
-                )
+        # Use get() as the locked keys may not have been restored yet (e.g.
+        # during deserialisation)
+        locked_keys = self.__dict__.get("_locked_keys")
+        if locked_keys is None:
+            # Intern string keys as they are added, so that lookups with the
+            # same string (e.g. a literal in the code) can match on identity
+            if isinstance(key, str):
+                key = sys.intern(key)
+        elif key not in locked_keys:
+            raise LockedKeyError(key, locked_keys)
         super().__setitem__(key, value)
 
     def __delitem__(self, key):
@@ -102,11 +157,8 @@ class LockedDict(UserDict):
 
         Raises
         ------
-        KeyError
-            Always, to disallow top-level key deletion.
+        LockedKeyDeletionError
+            Always, to disallow top-level key deletion (a subclass of
+            KeyError).
         """
-        raise KeyError(
-            f"Deletion of key '{key}' is not allowed. The set of top-level "
-            f"keys is locked to prevent accidental removal of expected "
-            f"parameters. Allowed top-level keys are: [{self._locked_keys}]"
-        )
+        raise LockedKeyDeletionError(key, self._locked_keys)
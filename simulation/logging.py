@@ -31,9 +31,7 @@ class SimLogger:
         The logging instance used for logging messages.
     """
     def __init__(self, log_to_console=False, log_to_file=False,
-                 file_path=("../outputs/logs/" +
-                            f"{time.strftime("%Y-%m-%d_%H-%M-%S")}.log"),
-                 sanitise=False):
+                 file_path=None, sanitise=False):
         """
         Initialise the Logger class.
 
@@ -43,14 +41,21 @@ class SimLogger:
             Whether to print log messages to the console.
         log_to_file : boolean
             Whether to save log to a file.
-        file_path : str
+        file_path : str or None
             Path to save log to file. Note, if you use an existing .log
-            file name, it will append to that log. Defaults to filename
-            based on current date and time, and folder "../outputs/log/".
+            file name, it will append to that log. If None (default), uses
+            a filename based on the current date and time, in the folder
+            "../outputs/logs/".
         sanitise : boolean
             Whether to sanitise dictionaries to remove memory addresses in
             logs, default False.
         """
+        # Create default file path here, rather than in the signature, where
+        # the time would be fixed when the module was first imported
+        if file_path is None:
+            file_path = ("../outputs/logs/" +
+                         f"{time.strftime('%Y-%m-%d_%H-%M-%S')}.log")
+
         self.log_to_console = log_to_console
         self.log_to_file = log_to_file
         self.file_path = file_path
@@ -157,6 +162,11 @@ class SimLogger:
         sim_time : float or None
             Current simulation time. If provided, prints before message.
         """
+        # Return early if logging is disabled, so that we don't spend time
+        # formatting messages that will never be shown
+        if not (self.log_to_console or self.log_to_file):
+            return
+
         # Sanitise (if enabled) and pretty format dictionaries
         if isinstance(msg, dict):
             if self.sanitise:
@@ -164,9 +174,8 @@ class SimLogger:
                        for key, value in msg.items()}
             msg = pformat(msg, indent=4)
 
-        if self.log_to_console or self.log_to_file:
-            # Log message, with simulation time rounded to 3dp if given.
-            if sim_time is not None:
-                self.logger.info("%0.3f: %s", sim_time, msg)
-            else:
-                self.logger.info(msg)
+        # Log message, with simulation time rounded to 3dp if given.
+        if sim_time is not None:
+            self.logger.info("%0.3f: %s", sim_time, msg)
+        else:
+            self.logger.info(msg)
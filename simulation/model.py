@@ -13,6 +13,7 @@ import simpy
 from sim_tools.distributions import DistributionRegistry
 
 from .patient import Patient
+from .samplers import BufferedSampler, DiscreteSampler
 
 
 class Model:
@@ -37,6 +38,8 @@ class Model:
         Number of patients currently in the rehabilitation unit.
     audit_list: list
         List to store metrics recorded at regular intervals.
+    log_events: boolean
+        Whether to log each patient event (i.e. if logging is enabled).
     seed_generator: iterator
         An iterator that yields independent random seeds when iterated over.
     arrival_dist: dictionary
@@ -46,6 +49,14 @@ class Model:
     los_dist: dictionary
         The length of stay (LOS) sampling distributions by unit and patient
         type.
+    sampler: dictionary
+        Objects used to sample from each distribution during the simulation,
+        with the same structure as dist (sampler[type][unit][patient]).
+        Each is a BufferedSampler, which draws samples in blocks. Routing
+        distributions are also wrapped in a DiscreteSampler.
+    los_sampler: dictionary
+        The LOS sampler for each unit, patient type and destination after the
+        unit (los_sampler[unit][(patient, destination)]).
     """
     def __init__(self, param, run_number):
         """
@@ -76,12 +87,18 @@ class Model:
         self.rehab_occupancy = 0
         self.audit_list = []
 
+        # Check once whether events need logging, so that the per-event log
+        # messages are only built when they will actually be used
+        self.log_events = (self.param.logger.log_to_console or
+                           self.param.logger.log_to_file)
+
         # Create all the distributions
         flat_dist = DistributionRegistry.create_batch(
             config=dict(self.param.dist_config), main_seed=self.run_number
         )
         # Restructure as dist[type][unit][patient]
         self.dist = {}
+        self.sampler = {}
         for key, obj in flat_dist.items():
             parts = key.split('_')
             unit = parts[0]
@@ -89,6 +106,63 @@ class Model:
             patient = '_'.join(parts[2:])
             self.dist.setdefault(dist_type, {}) \
                 .setdefault(unit, {})[patient] = obj
+            # Routing is sampled with a precomputed cumulative distribution,
+            # which gives the same values without the per-draw set-up cost
+            if dist_type == "routing":
+                obj = DiscreteSampler(obj)
+            # Samples are drawn in blocks, rather than one call at a time
+            self.sampler.setdefault(dist_type, {}) \
+                .setdefault(unit, {})[patient] = BufferedSampler(obj)
+
+        # Match each patient type and destination to their LOS sampler, so
+        # the unit processes can find it with a single lookup
+        self.los_sampler = {unit: self.create_los_lookup(unit)
+                            for unit in self.sampler["los"]}
+
+    def create_los_lookup(self, unit):
+        """
+        Find the length of stay (LOS) sampler for each patient type and
+        destination after the unit.
+
+        For stroke patients, this depends on whether they are going to the
+        ESD (stroke_esd) or not (stroke_noesd), or if they pass away on the
+        ASU (stroke_mortality). For other patients, it is just the same as
+        patient_type.
+
+        Parameters
+        ----------
+        unit: str
+            The unit ("asu", "rehab").
+
+        Returns
+        -------
+        dict
+            LOS sampler for each (patient_type, destination) tuple, where the
+            destinations are the values of that patient's routing
+            distribution.
+
+        Raises
+        ------
+        ValueError
+            If a stroke patient's destination after the ASU is invalid.
+        """
+        lookup = {}
+        for patient_type, routing in self.dist["routing"][unit].items():
+            for destination in routing.values.tolist():
+                if patient_type != "stroke":
+                    los_type = patient_type
+                elif destination == "esd":
+                    los_type = "stroke_esd"
+                elif unit == "rehab" or destination == "rehab":
+                    los_type = "stroke_noesd"
+                elif destination == "other":
+                    los_type = "stroke_mortality"
+                else:
+                    raise ValueError("Stroke post-asu destination '" +
+                                     f"{destination}' invalid")
+                lookup[patient_type, destination] = (
+                    self.sampler["los"][unit][los_type])
+        return lookup
 
     def patient_generator(self, patient_type, unit):
         """
@@ -101,9 +175,15 @@ class Model:
         unit: str
             The unit the patient is arriving at ("asu", "rehab").
         """
+        # Look up the arrival distribution and the unit process once, rather
+        # than repeating the nested dictionary lookups for every arrival
+        sample_iat = self.sampler["arrival"][unit][patient_type].sample
+        unit_process = {"asu": self.acute_stroke_unit,
+                        "rehab": self.rehab_unit}[unit]
+
         while True:
             # Sample and pass time to arrival
-            sampled_iat = self.dist["arrival"][unit][patient_type].sample()
+            sampled_iat = sample_iat()
             yield self.env.timeout(sampled_iat)
 
             # Create a new patient and add to the patients list
@@ -115,10 +195,9 @@ class Model:
             # the acute stroke unit or rehab unit
             if unit == "asu":
                 patient.asu_arrival_time = self.env.now
-                self.env.process(self.acute_stroke_unit(patient))
-            elif unit == "rehab":
+            else:
                 patient.rehab_arrival_time = self.env.now
-                self.env.process(self.rehab_unit(patient))
+            self.env.process(unit_process(patient))
 
     def acute_stroke_unit(self, patient):
         """
@@ -134,44 +213,35 @@ class Model:
         self.asu_occupancy += 1
 
         # Log the arrival time
-        self.param.logger.log(
-            sim_time=patient.asu_arrival_time,
-            msg=(f"Patient {patient.patient_id} ({patient.patient_type}) " +
-                 "arrive at ASU."))
+        if self.log_events:
+            self.param.logger.log(
+                sim_time=patient.asu_arrival_time,
+                msg=(f"Patient {patient.patient_id} " +
+                     f"({patient.patient_type}) arrive at ASU."))
 
         # Sample destination after ASU (we do this immediately on arrival
         # in the ASU, as the destination influences the length of stay)
         patient.post_asu_destination = (
-            self.dist["routing"]["asu"][patient.patient_type].sample())
+            self.sampler["routing"]["asu"][patient.patient_type].sample())
 
         # Log the post-ASU destination
-        self.param.logger.log(
-            sim_time=self.env.now,
-            msg=(f"Patient {patient.patient_id} ({patient.patient_type}) " +
-                 f"post-ASU: {patient.post_asu_destination}"))
-
-        # If it is a stroke patient, find out if they are going to the ESD
-        # (stroke_esd) or not (stroke_noesd) or if they pass away
-        # (stroke_mortality). For other patients, just same as patient_type.
-        if patient.patient_type == "stroke":
-            if patient.post_asu_destination == "esd":
-                routing_type = "stroke_esd"
-            elif patient.post_asu_destination == "rehab":
-                routing_type = "stroke_noesd"
-            elif patient.post_asu_destination == "other":
-                routing_type = "stroke_mortality"
-            else:
-                raise ValueError("Stroke post-asu destination '" +
-                                 f"{patient.post_asu_destination}' invalid")
-        else:
-            routing_type = patient.patient_type
-
-        # Sample LOS on the ASU, log it and pass time
-        patient.asu_los = self.dist["los"]["asu"][routing_type].sample()
-        self.param.logger.log(
-            sim_time=self.env.now,
-            msg=(f"Patient {patient.patient_id} ({patient.patient_type}) " +
-                 f"LOS on ASU: {patient.asu_los:.3f}"))
+        if self.log_events:
+            self.param.logger.log(
+                sim_time=self.env.now,
+                msg=(f"Patient {patient.patient_id} " +
+                     f"({patient.patient_type}) post-ASU: " +
+                     f"{patient.post_asu_destination}"))
+
+        # Sample LOS on the ASU (which, for stroke patients, depends on their
+        # destination), log it and pass time
+        patient.asu_los = self.los_sampler["asu"][
+            patient.patient_type, patient.post_asu_destination].sample()
+        if self.log_events:
+            self.param.logger.log(
+                sim_time=self.env.now,
+                msg=(f"Patient {patient.patient_id} " +
+                     f"({patient.patient_type}) LOS on ASU: " +
+                     f"{patient.asu_los:.3f}"))
         yield self.env.timeout(patient.asu_los)
 
         # If patient is going to rehab next, record arrival time and start that
@@ -192,37 +262,34 @@ class Model:
         self.rehab_occupancy += 1
 
         # Log the arrival time
-        self.param.logger.log(
-            sim_time=patient.rehab_arrival_time,
-            msg=(f"Patient {patient.patient_id} ({patient.patient_type}) " +
-                 "arrive at rehab."))
+        if self.log_events:
+            self.param.logger.log(
+                sim_time=patient.rehab_arrival_time,
+                msg=(f"Patient {patient.patient_id} " +
+                     f"({patient.patient_type}) arrive at rehab."))
 
         # Sample destination after rehab
         patient.post_rehab_destination = (
-            self.dist["routing"]["rehab"][patient.patient_type].sample())
+            self.sampler["routing"]["rehab"][patient.patient_type].sample())
 
         # Log the post-rehab destination
-        self.param.logger.log(
-            sim_time=self.env.now,
-            msg=(f"Patient {patient.patient_id} ({patient.patient_type}) " +
-                 f"post-rehab: {patient.post_rehab_destination}"))
-
-        # If it is a stroke patient,find out if they are going to the ESD
-        # (stroke_esd) or not (stroke_noesd) - else, just same as patient_type
-        if patient.patient_type == "stroke":
-            if patient.post_rehab_destination == "esd":
-                routing_type = "stroke_esd"
-            else:
-                routing_type = "stroke_noesd"
-        else:
-            routing_type = patient.patient_type
-
-        # Sample LOS on the rehab unit, log it and pass time
-        patient.rehab_los = self.dist["los"]["rehab"][routing_type].sample()
-        self.param.logger.log(
-            sim_time=self.env.now,
-            msg=(f"Patient {patient.patient_id} ({patient.patient_type}) " +
-                 f"LOS on rehab unit: {patient.rehab_los:.3f}"))
+        if self.log_events:
+            self.param.logger.log(
+                sim_time=self.env.now,
+                msg=(f"Patient {patient.patient_id} " +
+                     f"({patient.patient_type}) post-rehab: " +
+                     f"{patient.post_rehab_destination}"))
+
+        # Sample LOS on the rehab unit (which, for stroke patients, depends on
+        # their destination), log it and pass time
+        patient.rehab_los = self.los_sampler["rehab"][
+            patient.patient_type, patient.post_rehab_destination].sample()
+        if self.log_events:
+            self.param.logger.log(
+                sim_time=self.env.now,
+                msg=(f"Patient {patient.patient_id} " +
+                     f"({patient.patient_type}) LOS on rehab unit: " +
+                     f"{patient.rehab_los:.3f}"))
         yield self.env.timeout(patient.rehab_los)
 
         # Remove from occupancy count
@@ -279,8 +346,10 @@ class Model:
         Run the simulation.
         """
         # Add model initialisation details to the log
+        # (los_sampler is left out, as it only repeats samplers in sampler)
         self.param.logger.log(sim_time=self.env.now, msg="Initialise model:\n")
-        self.param.logger.log(vars(self))
+        self.param.logger.log({key: value for key, value in vars(self).items()
+                               if key != "los_sampler"})
         self.param.logger.log(msg="Parameters:\n ")
         self.param.logger.log(vars(self.param))
         self.param.logger.log(msg="Logger:\n ")
@@ -5,15 +5,61 @@ It includes arrival rates, length of stay distributions, and routing
 probabilities between different care settings.
 """
 
+from functools import lru_cache
 import json
 import os
-import time
 
 from .lockeddict import LockedDict
 from .logging import SimLogger
 from .restrictattributes import RestrictAttributes
 
 
+# Default parameter file, resolved once on import rather than for every Param
+DEFAULT_PARAMETER_FILE = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                 "../inputs/parameters.json")
+)
+
+
+@lru_cache(maxsize=8)
+def read_parameter_file(parameter_file, mtime):
+    """
+    Read the contents of a JSON parameter file.
+
+    The result is cached, so that creating many Param objects (e.g. for
+    scenarios) only reads the file from disk once. The modification time is
+    part of the cache key, so the file is read again if it has changed.
+
+    Parameters
+    ----------
+    parameter_file : str
+        Path to the JSON file.
+    mtime : float
+        Modification time of the file (from os.path.getmtime()).
+
+    Returns
+    -------
+    str
+        Contents of the file. This is parsed by each caller, so that every
+        Param gets its own copy of the configuration to modify.
+    """
+    # pylint: disable=unused-argument
+    with open(parameter_file, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+# Conditions used by Param.check_param_validity(), defined once here rather
+# than creating new lambda functions every time parameters are checked
+def is_non_negative(value):
+    """Return True if value is greater than or equal to 0."""
+    return value >= 0
+
+
+def is_positive(value):
+    """Return True if value is greater than 0."""
+    return value > 0
+
+
 class Param(RestrictAttributes):
     """
     Default parameters for simulation.
@@ -48,8 +94,7 @@ class Param(RestrictAttributes):
         cores=1,
         log_to_console=False,
         log_to_file=False,
-        log_file_path=("../outputs/logs/" +
-                       f"{time.strftime("%Y-%m-%d_%H-%M-%S")}.log")
+        log_file_path=None
     ):
         """
         Initialise a parameter set for the simulation.
@@ -58,7 +103,8 @@ class Param(RestrictAttributes):
         ----------
         parameter_file : str
             JSON file containing parameters to load to sim-tools
-            DistributionRegistry.
+            DistributionRegistry. Defaults to DEFAULT_PARAMETER_FILE
+            (inputs/parameters.json).
         parameter_config : dict
             Dictionary of parameters (bypasses file loading if given).
         warm_up_period : int
@@ -76,9 +122,11 @@ class Param(RestrictAttributes):
             Whether to print log messages to the console.
         log_to_file : boolean
             Whether to save log to a file.
-        log_file_path : str
+        log_file_path : str or None
             Path to save log to file. Note, if you use an existing .log
-            file name, it will append to that log.
+            file name, it will append to that log. If None (default), uses
+            a filename based on the current date and time, in the folder
+            "../outputs/logs/".
         """
         # Load configuration from dict if provided
         if parameter_config is not None:
@@ -86,13 +134,9 @@ class Param(RestrictAttributes):
         else:
             # Fallback: load from file
             if parameter_file is None:
-                parameter_file = os.path.normpath(
-                    os.path.join(
-                        os.path.dirname(os.path.abspath(__file__)),
-                        "../inputs/parameters.json")
-                )
-            with open(parameter_file, "r", encoding="utf-8") as f:
-                config = json.load(f)
+                parameter_file = DEFAULT_PARAMETER_FILE
+            config = json.loads(read_parameter_file(
+                parameter_file, os.path.getmtime(parameter_file)))
 
         # Accept either a config containing "simulation_parameters" or just
         # the dict itself
@@ -139,13 +183,13 @@ class Param(RestrictAttributes):
         # Validate parameters that must be >= 0
         for param in ["warm_up_period", "data_collection_period"]:
             self.validate_param(
-                param, lambda x: x >= 0,
+                param, is_non_negative,
                 "must be greater than or equal to 0")
 
         # Validate parameters that must be > 0
         for param in ["number_of_runs", "audit_interval"]:
             self.validate_param(
-                param, lambda x: x > 0,
+                param, is_positive,
                 "must be greater than 0")
 
     def validate_param(self, param_name, condition, error_msg):
@@ -9,9 +9,11 @@ little book of DES (https://github.com/hsma-programme/hsma6_des_book)
 (MIT Licence).
 """
 
-import numpy as np
+from dataclasses import dataclass
+from math import nan
 
 
+@dataclass(slots=True, eq=False)
 class Patient:
     """
     Represents a patient.
@@ -34,21 +36,20 @@ class Patient:
         Destination after rehab ("esd", "other").
     rehab_los: float
         Length of stay on the rehabilitation unit in days.
+
+    Notes
+    -----
+    A patient is created for every arrival, so this is a slotted dataclass,
+    which avoids allocating a per-instance dictionary. Only patient_id and
+    patient_type are required - the rest are set as the patient moves
+    through the pathway, and are NaN until then. Equality is not generated
+    (eq=False), so patients are compared by identity and remain hashable.
     """
-    def __init__(self, patient_id, patient_type):
-        """
-        Parameters
-        ----------
-        patient_id: int, float or str
-            Unique patient identifier.
-        patient_type: str
-            Patient type ("stroke", "tia", "neuro" or "other").
-        """
-        self.patient_id = patient_id
-        self.patient_type = patient_type
-        self.asu_arrival_time = np.nan
-        self.post_asu_destination = np.nan
-        self.asu_los = np.nan
-        self.rehab_arrival_time = np.nan
-        self.post_rehab_destination = np.nan
-        self.rehab_los = np.nan
+    patient_id: int | float | str
+    patient_type: str
+    asu_arrival_time: float = nan
+    post_asu_destination: str | float = nan
+    asu_los: float = nan
+    rehab_arrival_time: float = nan
+    post_rehab_destination: str | float = nan
+    rehab_los: float = nan
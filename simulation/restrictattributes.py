@@ -4,6 +4,40 @@ post-initialisation.
 """
 
 
+class AttributeRestrictionError(AttributeError):
+    """
+    Error raised on an attempt to add a new attribute to a RestrictAttributes
+    instance after initialisation.
+
+    The message, which lists the existing attributes, is only built when the
+    error is displayed, rather than when it is raised.
+
+    Attributes
+    ----------
+    name: str
+        The name of the attribute that could not be added.
+    existing: tuple
+        Names of the existing attributes.
+    """
+    def __init__(self, name, existing):
+        """
+        Parameters
+        ----------
+        name: str
+            The name of the attribute that could not be added.
+        existing: iterable
+            Names of the existing attributes.
+        """
+        existing = tuple(existing)
+        super().__init__(name, existing)
+        self.name = name
+        self.existing = existing
+
+    def __str__(self):
+        return (f"Cannot add new attribute '{self.name}' - only possible to " +
+                f"modify existing attributes: {', '.join(self.existing)}.")
+
+
 class RestrictAttributesMeta(type):
     """
     Metaclass for attribute restriction.
@@ -46,17 +80,18 @@ class RestrictAttributes(metaclass=RestrictAttributesMeta):
 
         Raises
         ------
-        AttributeError
+        AttributeRestrictionError
             If `name` is not an existing attribute and an attempt is made
-            to add it to the class instance.
+            to add it to the class instance (a subclass of AttributeError).
         """
-        # Check if the instance is initialised and the attribute doesn"t exist
-        if hasattr(self, "_initialised") and not hasattr(self, name):
-            # Get a list of existing attributes for the error message
-            existing = ", ".join(self.__dict__.keys())
-            raise AttributeError(
-                f"Cannot add new attribute '{name}' - only possible to " +
-                f"modify existing attributes: {existing}."
-            )
+        # Check if the instance is initialised and the attribute doesn"t exist.
+        # Both are looked up in the instance dictionary, as hasattr() has to
+        # search the class (and raise an AttributeError) on a miss. The class
+        # is only checked for names not found there (e.g. properties).
+        instance_dict = self.__dict__
+        if ("_initialised" in instance_dict and
+                name not in instance_dict and
+                not hasattr(type(self), name)):
+            raise AttributeRestrictionError(name, instance_dict.keys())
         # If checks pass, set the attribute using the standard method
         object.__setattr__(self, name, value)
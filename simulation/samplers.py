@@ -0,0 +1,139 @@
+"""
+Samplers used on the hot path of the simulation model.
+
+These wrap the sim-tools distributions created by the model, reproducing
+their random streams exactly whilst doing less work per draw.
+"""
+
+
+class DiscreteSampler:
+    """
+    Categorical sampler with a precomputed cumulative distribution.
+
+    ``DiscreteEmpirical.sample()`` calls ``rng.choice(values, p=...)``, which
+    validates the probabilities and recomputes their cumulative sum on every
+    draw. This sampler does that work once, so each draw is a single uniform
+    random number and a binary search of the cumulative distribution. Many
+    samples can be drawn at once, with a single vectorised search.
+
+    It uses the same generator and the same inverse-transform as
+    ``rng.choice``, so it returns exactly the same sequence of values as the
+    wrapped distribution would have done.
+
+    Attributes
+    ----------
+    dist: sim_tools.distributions.DiscreteEmpirical
+        The wrapped distribution.
+    rng: numpy.random.Generator
+        The random number generator of the wrapped distribution.
+    values: numpy.ndarray
+        Possible outcome values.
+    cdf: numpy.ndarray
+        Cumulative probability of each value (last element equal to 1).
+    """
+    def __init__(self, dist):
+        """
+        Parameters
+        ----------
+        dist: sim_tools.distributions.DiscreteEmpirical
+            Distribution to sample from.
+        """
+        self.dist = dist
+        self.rng = dist.rng
+        self.values = dist.values
+        # Computed as in numpy.random.Generator.choice(), so that draws match
+        cdf = dist.probabilities.cumsum()
+        cdf /= cdf[-1]
+        self.cdf = cdf
+
+    def __repr__(self):
+        """
+        Represent the sampler by the distribution it wraps, so that logs
+        (e.g. of the model's attributes) don't contain memory addresses.
+        """
+        return f"DiscreteSampler({self.dist!r})"
+
+    def sample(self, size=None):
+        """
+        Generate random samples from the distribution.
+
+        Parameters
+        ----------
+        size: int or tuple of ints, optional
+            The number/shape of samples to generate. If None (default),
+            returns a single sample.
+
+        Returns
+        -------
+        Any or numpy.ndarray
+            A single value (of whatever type was in the values array) when
+            size is None, else a numpy array of values with shape size.
+        """
+        if size is None:
+            idx = self.cdf.searchsorted(self.rng.random(), side="right")
+            return self.values[idx].item()
+        idx = self.cdf.searchsorted(self.rng.random(size), side="right")
+        return self.values[idx]
+
+
+class BufferedSampler:
+    """
+    Draws samples from a distribution in blocks, and returns them one at a
+    time.
+
+    Calling ``sample()`` on a sim-tools distribution makes one call into
+    numpy per draw. This sampler instead draws ``block_size`` values at
+    once with ``dist.sample(size=block_size)``, and hands them out from a
+    buffer, refilling it when it runs out. The model can't draw a whole
+    run's worth of samples in advance, as the number needed depends on the
+    run, but blocks give most of the benefit of vectorised sampling.
+
+    Numpy generators produce the same stream of values whether they are
+    drawn singly or in blocks, so results are identical to sampling
+    directly from the distribution (although more values may be drawn from
+    the generator than are used).
+
+    Attributes
+    ----------
+    dist: object
+        Distribution to sample from. Must have a ``sample(size)`` method.
+    block_size: int
+        Number of samples to draw each time the buffer is refilled.
+    """
+    def __init__(self, dist, block_size=256):
+        """
+        Parameters
+        ----------
+        dist: object
+            Distribution to sample from. Must have a ``sample(size)`` method
+            which returns a numpy array.
+        block_size: int
+            Number of samples to draw each time the buffer is refilled.
+        """
+        self.dist = dist
+        self.block_size = block_size
+        self._buffer = iter(())
+
+    def __repr__(self):
+        """
+        Represent the sampler by the distribution it wraps, so that logs
+        (e.g. of the model's attributes) don't contain memory addresses.
+        """
+        return f"BufferedSampler({self.dist!r})"
+
+    def sample(self):
+        """
+        Return the next sample from the distribution.
+
+        Returns
+        -------
+        Any
+            A single sample, as a Python scalar (e.g. float or str).
+        """
+        try:
+            return next(self._buffer)
+        except StopIteration:
+            # Draw the next block, converted to Python scalars with tolist()
+            block = self.dist.sample(size=self.block_size)
+            self._buffer = iter(block.tolist())
+            return next(self._buffer)
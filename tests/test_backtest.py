@@ -9,38 +9,75 @@ from pathlib import Path
 import pandas as pd
 import pytest
 
-from simulation import Model, Param, Runner
+from simulation import Param, Runner
 
 
-def test_model():
+# Folder containing the expected results
+EXP_DIR = Path(__file__).parent / "exp_results"
+
+# Column types of the expected results, so pandas doesn't have to infer them
+AUDIT_LIST_DTYPES = {
+    "time": "int64",
+    "asu_occupancy": "int64",
+    "rehab_occupancy": "int64"
+}
+OCCUPANCY_DTYPES = {
+    "beds": "int64",
+    "freq": "int64",
+    "pct": "float64",
+    "c_pct": "float64",
+    "prob_delay": "float64",
+    "1_in_n_delay": "float64"
+}
+
+# Keep these tests on one pytest-xdist worker, so they all share the results
+# from the single_run fixture rather than each worker running the model
+pytestmark = pytest.mark.xdist_group("backtest")
+
+
+@pytest.fixture(scope="module", name="single_run")
+def fixture_single_run():
+    """
+    Fixture: runs the model once with default parameters (run 0), so the
+    back tests share one set of results rather than each re-running it.
+    """
+    return Runner(param=Param()).run_single(run=0)
+
+
+def test_model(single_run):
     """
     Compare audit_list from Model to one generated previously.
 
+    Parameters
+    ----------
+    single_run: dict
+        Results from a single run of the model (fixture).
+
     Notes
     -----
     This is adapted from `test_reproduction` in
     github.com/pythonhealthdatascience/pydesrap_mms.
     """
-    # Run model and get audit list as a dataframe
-    model = Model(param=Param(), run_number=0)
-    model.run()
-    audit_list = pd.DataFrame(model.audit_list)
+    # Get audit list from the model run as a dataframe
+    audit_list = pd.DataFrame(single_run["audit_list"])
 
     # Import expected result
-    exp_audit_list = pd.read_csv(
-        Path(__file__).parent.joinpath("exp_results/audit_list.csv"))
+    exp_audit_list = pd.read_csv(EXP_DIR / "audit_list.csv",
+                                 dtype=AUDIT_LIST_DTYPES, memory_map=True)
 
     # Compare the generated and expected results
     pd.testing.assert_frame_equal(audit_list, exp_audit_list)
 
 
 @pytest.mark.parametrize("unit", [("asu"), ("rehab")])
-def test_runner(unit):
+def test_runner(single_run, unit):
     """
     Compare the occupancy dataframes from Runner to those generated before.
 
     Parameters
     ----------
+    single_run: dict
+        Results from a single run of the model (fixture).
     unit: str
         Unit to assess results from ("asu", "rehab")
 
@@ -49,13 +86,12 @@ def test_runner(unit):
     This is adapted from `test_reproduction` in
     github.com/pythonhealthdatascience/pydesrap_mms.
     """
-    # Run model and get occupancy dataframe
-    runner = Runner(param=Param())
-    occupancy = runner.run_single(run=0)[unit]
+    # Get occupancy dataframe from the model run
+    occupancy = single_run[unit]
 
     # Import expected result
-    exp_occupancy = pd.read_csv(
-        Path(__file__).parent.joinpath(f"exp_results/{unit}_occupancy.csv"))
+    exp_occupancy = pd.read_csv(EXP_DIR / f"{unit}_occupancy.csv",
+                                dtype=OCCUPANCY_DTYPES, memory_map=True)
 
     # Compare the generated and expected results
     pd.testing.assert_frame_equal(occupancy, exp_occupancy)
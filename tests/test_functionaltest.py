@@ -5,6 +5,8 @@ Functional tests verify that the system or components perform their intended
 functionality.
 """
 
+import math
+
 from joblib import cpu_count
 import numpy as np
 import pandas as pd
@@ -13,6 +15,10 @@ import pytest
 from simulation import Model, Param, Runner
 
 
+# Number of CPUs, found once when the module is collected
+CPU_COUNT = cpu_count()
+
+
 # -----------------------------------------------------------------------------
 # Modifying parameters
 # -----------------------------------------------------------------------------
@@ -55,7 +61,10 @@ def test_param_typo_key(testparam):
 # Running the model
 # -----------------------------------------------------------------------------
 
-@pytest.mark.parametrize("warm_up_period", [(0), (1)])
+@pytest.mark.parametrize("warm_up_period", [
+    pytest.param(0, id="no_warmup"),
+    pytest.param(1, id="warmup")
+])
 def test_audit_length(warm_up_period):
     """
     Given that we set an audit interval of 1, and that first audit is performed
@@ -99,8 +108,10 @@ def test_high_iat():
     -----
     Inspired by `ev_test_2` from github.com/pythonhealthdatascience/llm_simpy/.
     """
-    # Set high inter-arrival time for all patient types
-    param = Param()
+    # Set high inter-arrival time for all patient types. A short run is
+    # enough, as no arrivals are expected at any point, and having no warm-up
+    # means none could be wiped from the results.
+    param = Param(warm_up_period=0, data_collection_period=100)
     for key in param.dist_config:
         if "arrival" in key:
             param.dist_config[key]["params"]["mean"] = 10_000_000
@@ -133,7 +144,8 @@ def test_long_los(stroke_noesd_mean):
     # Set high length of stay for all patient types except stroke_no_esd_mean.
     # Also, no warm-up period, otherwise arrivals != occupancy (as arrivals
     # excludes warm-up, but occupancy does not, if they are still present).
-    param = Param(warm_up_period=0, data_collection_period=1000)
+    # A short run is enough for some stroke_noesd patients to depart.
+    param = Param(warm_up_period=0, data_collection_period=100)
     for key in param.dist_config:
         if "los" in key:
             if "stroke_noesd" in key:
@@ -178,61 +190,79 @@ def test_warmup_only():
     assert model.rehab_occupancy > 0
 
 
-def test_warmup_impact():
+@pytest.fixture(scope="module", name="warmup_model", params=[
+    pytest.param(0, id="no_warmup"),
+    pytest.param(500, id="warmup")
+])
+def fixture_warmup_model(request):
+    """
+    Fixture: runs the model without (0) and with (500) a warm-up period, once
+    each for the whole module, so the warm-up impact tests share the runs.
+
+    Only the start of the results is checked, so a short data collection
+    period is enough.
+    """
+    param = Param(warm_up_period=request.param, data_collection_period=30)
+    model = Model(param=param, run_number=0)
+    model.run()
+    return model
+
+
+@pytest.mark.xdist_group("warmup_impact")
+def test_warmup_first_arrival(warmup_model):
     """
-    Check that running with warm-up leads to different results than without.
+    Check that the first patient arrives after the warm-up period (or after
+    time 0, if there is no warm-up).
+
+    Parameters
+    ----------
+    warmup_model: Model
+        Model run with or without a warm-up period (fixture).
 
     Notes
     -----
     Adapted from `test_warmup_impact` in
     github.com/pythonhealthdatascience/pydesrap_mms/.
     """
-    def helper_warmup(warm_up_period):
-        """
-        Helper function to run model with high arrivals and specified warm-up.
-
-        Parameters
-        ----------
-        warm_up_period : float
-            Duration of the warm-up period - running simulation but not yet
-            collecting results.
-        """
-        param = Param(warm_up_period=warm_up_period,
-                      data_collection_period=1500)
-        model = Model(param=param, run_number=0)
-        model.run()
-        return model
+    warm_up_period = warmup_model.param.warm_up_period
+    first_arrival = warmup_model.patients[0].asu_arrival_time
+    assert first_arrival > warm_up_period, (
+        f"Expect first patient to arrive after time {warm_up_period} when " +
+        f"model is run with warm-up of length {warm_up_period}, but got " +
+        f"{first_arrival}."
+    )
 
-    # Run model with and without warm-up period
-    model_warmup = helper_warmup(warm_up_period=500)
-    model_none = helper_warmup(warm_up_period=0)
 
-    # Extract result of first patient
-    first_warmup = model_warmup.patients[0]
-    first_none = model_none.patients[0]
+@pytest.mark.xdist_group("warmup_impact")
+def test_warmup_first_audit(warmup_model):
+    """
+    Check that the first interval audit is at the end of the warm-up period,
+    and that it has occupancy 0 without warm-up, but occupancy > 0 with
+    warm-up (from patients who arrived during warm-up).
 
-    # Check that model with warm-up has arrival time later than warm-up length
-    assert first_warmup.asu_arrival_time > 500, (
-        "Expect first patient to arrive after time 500 when model is run " +
-        f"with warm-up (length 500), but got {first_warmup.asu_arrival_time}."
-    )
+    Parameters
+    ----------
+    warmup_model: Model
+        Model run with or without a warm-up period (fixture).
 
-    # Check that model without warm-up has arrival first arrival after time 0
-    assert first_none.asu_arrival_time > 0, (
-        "Expect first patient to arrive after time 0 when model is run " +
-        f"without warm-up, but got {first_none.asu_arrival_time}."
-    )
+    Notes
+    -----
+    Adapted from `test_warmup_impact` in
+    github.com/pythonhealthdatascience/pydesrap_mms/.
+    """
+    warm_up_period = warmup_model.param.warm_up_period
+    first_audit = warmup_model.audit_list[0]
 
-    # Check that the first interval audit entry with no warm-up has occupancy
-    # 0, but first entry with warm-up has occupancy > 0
-    assert model_warmup.audit_list[0]["asu_occupancy"] > 0
-    assert model_warmup.audit_list[0]["rehab_occupancy"] > 0
-    assert model_none.audit_list[0]["asu_occupancy"] == 0
-    assert model_none.audit_list[0]["rehab_occupancy"] == 0
+    # Check time of first entry in the audit list
+    assert first_audit["time"] == warm_up_period
 
-    # Check time of first entry in the audit lists
-    assert model_warmup.audit_list[0]["time"] == 500
-    assert model_none.audit_list[0]["time"] == 0
+    # Check occupancy of first entry in the audit list
+    if warm_up_period > 0:
+        assert first_audit["asu_occupancy"] > 0
+        assert first_audit["rehab_occupancy"] > 0
+    else:
+        assert first_audit["asu_occupancy"] == 0
+        assert first_audit["rehab_occupancy"] == 0
 
 
 def test_changing_occupancy():
@@ -253,7 +283,7 @@ def test_changing_occupancy():
         mean_value : float
             Mean ASU stroke IAT.
         """
-        param = Param()
+        param = Param(warm_up_period=100, data_collection_period=365)
         param.dist_config["asu_arrival_stroke"]["params"]["mean"] = mean_value
         model = Model(param, run_number=0)
         model.run()
@@ -272,22 +302,43 @@ def test_changing_occupancy():
     )
 
     # Check that sum of the audit occupancies is higher with more arrivals
-    initial_audit = pd.DataFrame(initial_model.audit_list)
-    adj_audit = pd.DataFrame(adj_model.audit_list)
-
-    i_asu = initial_audit["asu_occupancy"].sum()
-    a_asu = adj_audit["asu_occupancy"].sum()
+    i_asu = sum(a["asu_occupancy"] for a in initial_model.audit_list)
+    a_asu = sum(a["asu_occupancy"] for a in adj_model.audit_list)
     assert i_asu > a_asu, (
         "Expect high IAT to have higher ASU occupancy than low IAT, but " +
         f"saw {i_asu} for high and {a_asu} for low")
 
-    i_reh = initial_audit["rehab_occupancy"].sum()
-    a_reh = adj_audit["rehab_occupancy"].sum()
+    i_reh = sum(a["rehab_occupancy"] for a in initial_model.audit_list)
+    a_reh = sum(a["rehab_occupancy"] for a in adj_model.audit_list)
     assert i_reh > a_reh, (
         "Expect high IAT to have higher rehab occupancy than low IAT, but " +
         f"saw {i_reh} for high and {a_reh} for low")
 
 
+def _sample_size(spread, tol, n_se=5):
+    """
+    Find the smallest sample size for which the tolerance of a check on a
+    sample mean spans n_se standard errors (the standard error being
+    spread / sqrt(n)).
+
+    Parameters
+    ----------
+    spread : float
+        Standard deviation of one draw. For a relative tolerance, this is
+        relative to the mean (i.e. the coefficient of variation).
+    tol : float
+        Tolerance of the check (relative or absolute, matching spread).
+    n_se : float
+        Number of standard errors that the tolerance should span.
+
+    Returns
+    -------
+    int
+        Sample size.
+    """
+    return max(math.ceil((n_se * spread / tol) ** 2), 1)
+
+
 def test_sampled_distributions():
     """
     Ensure that the mean of sampled values from arrival, length of stay and
@@ -301,6 +352,10 @@ def test_sampled_distributions():
     param = Param()
     model = Model(param, run_number=0)
 
+    # Tolerance for each check, with the sample sizes set by _sample_size()
+    rtol = 0.05
+    atol = 0.05
+
     def test_mean(dist_type):
         """
         For all units and patient types of the specified distribution types,
@@ -313,44 +368,58 @@ def test_sampled_distributions():
         """
         for unit in ["asu", "rehab"]:
             for patient_type, dist in model.dist[dist_type][unit].items():
-                # Get observed mean
-                samples = [dist.sample() for _ in range(10_000)]
-                observed = np.mean(samples)
-                # Get expected mean
+                # Get expected mean, and the coefficient of variation (which
+                # is 1 for exponential distributions, as sd equals the mean)
                 dist_key = f"{unit}_{dist_type}_{patient_type}"
-                expected = param.dist_config[dist_key]["params"]["mean"]
+                params = param.dist_config[dist_key]["params"]
+                expected = params["mean"]
+                cv = params.get("stdev", expected) / expected
+                # Get observed mean (drawing all samples in one call)
+                observed = dist.sample(size=_sample_size(cv, rtol)).mean()
                 # Compare the observed and expected mean
-                assert np.isclose(observed, expected, rtol=0.05), (
+                assert np.isclose(observed, expected, rtol=rtol), (
                     f"Sample mean for {unit} {dist_type} {patient_type}: "
                     f"{observed:.3f}, expected ≈ {expected:.3f}"
                 )
 
-    test_mean("arrival")
-    test_mean("los")
+    def test_routing(unit):
+        """
+        For all patient types in the specified unit, check that the sampled
+        probability of each destination is close to the expected probability.
 
-    # Test routing distributions
-    for unit in ["asu", "rehab"]:
+        Parameters
+        ----------
+        unit : str
+            Name of the unit to check ("asu", "rehab").
+        """
         for patient_type, dist in model.dist["routing"][unit].items():
-            # Observed probabilities
-            samples = [dist.sample() for _ in range(10_000)]
-            observed_probs = {dest: samples.count(dest) / len(samples)
-                              for dest in set(samples)}
             # Expected probabilities
             key = f"{unit}_routing_{patient_type}"
             values = param.dist_config[key]["params"]["values"]
             freq = param.dist_config[key]["params"]["freq"]
             expected_probs = dict(zip(values, freq))
+            # Observed probabilities, with the sample size set by the
+            # destination with the largest sd of its proportion (sqrt(p(1-p)))
+            max_sd = max(math.sqrt(p * (1 - p)) for p in freq)
+            samples = dist.sample(size=_sample_size(max_sd, atol))
+            dests, counts = np.unique(samples, return_counts=True)
+            observed_probs = dict(zip(dests.tolist(), counts / len(samples)))
             for dest in expected_probs:
                 # If a destination has a very low probability, it might not
                 # appear in samples. In that case, set the observed probability
                 # to 0
                 observed_prob = observed_probs.get(dest, 0)
                 assert np.isclose(observed_prob,
-                                  expected_probs[dest], atol=0.05), (
+                                  expected_probs[dest], atol=atol), (
                     f"Expected routing probability for {unit} {patient_type} "
                     f"to {dest} ≈ {expected_probs[dest]}, but got "
                     f"{observed_prob}.")
 
+    test_mean("arrival")
+    test_mean("los")
+    test_routing("asu")
+    test_routing("rehab")
+
 
 # -----------------------------------------------------------------------------
 # Seeds
@@ -365,15 +434,21 @@ def test_seed_stability():
     Adapted from `seed_seed_stability` in
     github.com/pythonhealthdatascience/pydesrap_mms/.
     """
-    # Run model twice, with same run number (and therefore same seed) each time
-    runner1 = Runner(param=Param())
+    # Run model twice, with same run number (and therefore same seed) each
+    # time. This holds for any run length, so a short run is used.
+    runner1 = Runner(param=Param(warm_up_period=100,
+                                 data_collection_period=365))
     result1 = runner1.run_single(run=33)
-    runner2 = Runner(param=Param())
+    runner2 = Runner(param=Param(warm_up_period=100,
+                                 data_collection_period=365))
     result2 = runner2.run_single(run=33)
 
-    # Check that the dataframes are equal
-    pd.testing.assert_frame_equal(result1["asu"], result2["asu"])
-    pd.testing.assert_frame_equal(result1["rehab"], result2["rehab"])
+    # Check that the dataframes are equal (exactly, as they should be
+    # identical, so there's no need for tolerance-based comparison)
+    pd.testing.assert_frame_equal(result1["asu"], result2["asu"],
+                                  check_exact=True)
+    pd.testing.assert_frame_equal(result1["rehab"], result2["rehab"],
+                                  check_exact=True)
 
 
 # -----------------------------------------------------------------------------
@@ -388,23 +463,35 @@ def test_parallel():
     -----
     Adapted from `test_parallel` in
     github.com/pythonhealthdatascience/pydesrap_mms/.
+
+    Where possible, this uses two cores rather than all available cores (-1),
+    as that is enough to run the replications in parallel, without paying to
+    start a worker for every core on the machine. On machines with fewer
+    than 3 CPUs, cores=2 is not valid, so it uses -1 instead.
     """
-    # Sequential (1 core) and parallel (-1 cores) execution
+    # Sequential (1 core) and parallel execution of two replications (with
+    # run_reps(), as run_single() always runs in the current process)
+    par_cores = 2 if CPU_COUNT >= 3 else -1
     results = {}
-    for mode, cores in [("seq", 1), ("par", -1)]:
-        param = Param(cores=cores)
+    for mode, cores in [("seq", 1), ("par", par_cores)]:
+        param = Param(warm_up_period=100, data_collection_period=365,
+                      number_of_runs=2, cores=cores)
         runner = Runner(param)
-        results[mode] = runner.run_single(run=0)
+        results[mode], _, _ = runner.run_reps()
 
     # Verify results are identical
     pd.testing.assert_frame_equal(results["seq"]["asu"],
-                                  results["par"]["asu"])
+                                  results["par"]["asu"], check_exact=True)
     pd.testing.assert_frame_equal(results["seq"]["rehab"],
-                                  results["par"]["rehab"])
+                                  results["par"]["rehab"], check_exact=True)
 
 
 @pytest.mark.parametrize("cores", [
-    (-2), (0), (cpu_count()), (cpu_count()+1)
+    (-2), (0),
+    # With one CPU, cores=1 is valid (and would run every replication)
+    pytest.param(CPU_COUNT, marks=pytest.mark.skipif(
+        CPU_COUNT < 2, reason="cores=1 is valid when there is one CPU")),
+    (CPU_COUNT+1)
 ])
 def test_valid_cores(cores):
     """
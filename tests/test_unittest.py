@@ -8,14 +8,16 @@ work as intended.
 
 from io import StringIO
 import logging
-import os
-from unittest.mock import patch, MagicMock
+import pickle
+from unittest.mock import patch
 
 import numpy as np
 import pytest
 from sim_tools.distributions import Exponential, Lognormal, DiscreteEmpirical
 
-from simulation import LockedDict, Model, Param, Runner, SimLogger
+from simulation import (
+    BufferedSampler, DiscreteSampler, LockedDict, Model, Param, Patient,
+    Runner, SimLogger)
 
 
 # -----------------------------------------------------------------------------
@@ -32,6 +34,22 @@ def test_new_attribute():
         setattr(param, "new_entry", 3)
 
 
+def test_new_attribute_error_message():
+    """
+    Check that the error raised on adding a new attribute names it and lists
+    the existing attributes, including after pickling (as when raised in a
+    worker process during parallel runs).
+    """
+    param = Param()
+    with pytest.raises(AttributeError) as exc_info:
+        param.new_entry = 3
+
+    for error in [exc_info.value, pickle.loads(pickle.dumps(exc_info.value))]:
+        assert "Cannot add new attribute 'new_entry'" in str(error)
+        assert "dist_config" in str(error)
+        assert "warm_up_period" in str(error)
+
+
 def test_param_valid():
     """
     Check that all default model parameters are valid.
@@ -44,6 +62,16 @@ def test_param_valid():
             f"check_param_validity() raised an unexpected exception: {exc}")
 
 
+def test_param_independent_config():
+    """
+    Check that each Param loads its own copy of the parameter file, so
+    changing the configuration of one has no effect on another.
+    """
+    param = Param()
+    param.dist_config["asu_arrival_stroke"]["params"]["mean"] = 99
+    assert Param().dist_config["asu_arrival_stroke"]["params"]["mean"] != 99
+
+
 @pytest.mark.parametrize("param, value, msg", [
     ("warm_up_period", -1,
      "Parameter 'warm_up_period' must be greater than or equal to 0"),
@@ -74,20 +102,18 @@ def test_create_distributions():
     param = Param()
     model = Model(param, run_number=42)
 
-    # Check that all arrival distributions are exponential
-    for _, unit_dict in model.dist["arrival"].items():
-        for patient_type in unit_dict:
-            assert isinstance(unit_dict[patient_type], Exponential)
-
-    # Check that all length of stay distributions are lognormal
-    for _, unit_dict in model.dist["los"].items():
-        for patient_type in unit_dict:
-            assert isinstance(unit_dict[patient_type], Lognormal)
-
-    # Check that all routing distributions are discrete
-    for _, unit_dict in model.dist["routing"].items():
-        for patient_type in unit_dict:
-            assert isinstance(unit_dict[patient_type], DiscreteEmpirical)
+    # Check that all arrival distributions are exponential, all length of
+    # stay distributions are lognormal, and all routing are discrete
+    expected_types = {"arrival": Exponential,
+                      "los": Lognormal,
+                      "routing": DiscreteEmpirical}
+    for dist_type, expected_type in expected_types.items():
+        for unit, unit_dict in model.dist[dist_type].items():
+            for patient_type, dist in unit_dict.items():
+                assert isinstance(dist, expected_type), (
+                    f"Expected {unit} {dist_type} {patient_type} to be " +
+                    f"{expected_type.__name__}, but got " +
+                    f"{type(dist).__name__}.")
 
 
 def test_sampling_seed_reproducibility():
@@ -101,14 +127,37 @@ def test_sampling_seed_reproducibility():
     model1 = Model(param, run_number=123)
     model2 = Model(param, run_number=123)
 
-    # Sample from a distribution in both models
-    samples1 = [model1.dist["arrival"]["asu"]["stroke"].sample()
-                for _ in range(10)]
-    samples2 = [model2.dist["arrival"]["asu"]["stroke"].sample()
-                for _ in range(10)]
+    # Sample from a distribution in both models (ten samples in one call)
+    samples1 = model1.dist["arrival"]["asu"]["stroke"].sample(size=10)
+    samples2 = model2.dist["arrival"]["asu"]["stroke"].sample(size=10)
 
     # Check that the samples are the same
-    np.testing.assert_array_almost_equal(samples1, samples2)
+    np.testing.assert_array_equal(samples1, samples2)
+
+
+def test_patient_identity():
+    """
+    Check that patients are compared by identity, so two patients with the
+    same ID are distinct, and that they can be used in sets and as dict keys.
+    """
+    patient1 = Patient(patient_id=1, patient_type="stroke")
+    patient2 = Patient(patient_id=1, patient_type="stroke")
+    assert patient1 != patient2
+    assert len({patient1, patient2}) == 2
+    assert {patient1: "a", patient2: "b"}[patient1] == "a"
+
+
+def test_invalid_stroke_destination():
+    """
+    Check that an invalid destination for stroke patients after the ASU
+    is caught when the model is created.
+    """
+    param = Param()
+    param.dist_config["asu_routing_stroke"]["params"]["values"] = [
+        "rehab", "esd", "home"]
+    with pytest.raises(ValueError,
+                       match="Stroke post-asu destination 'home' invalid"):
+        Model(param, run_number=0)
 
 
 def test_run_time():
@@ -154,12 +203,10 @@ def test_get_occupancy_freq():
     Inspired by `test_result_processing_1` and `test_result_processing_2` in
     github.com/pythonhealthdatascience/llm_simpy/.
     """
-    # Create test data
-    audit_list = []
-    for count, value in [(4, 1), (3, 2), (2, 3), (1, 4)]:
-        for _ in range(count):
-            audit_list.append({"asu_occupancy": value,
-                               "rehab_occupancy": value + 1})
+    # Create test data (occupancy 1 four times, 2 three times, and so on)
+    occupancy = np.repeat([1, 2, 3, 4], [4, 3, 2, 1])
+    audit_list = [{"asu_occupancy": value, "rehab_occupancy": value + 1}
+                  for value in occupancy.tolist()]
 
     # Define expected values for our test data
     expected_beds = [1, 2, 3, 4]
@@ -180,8 +227,8 @@ def test_get_occupancy_freq():
         "beds", "freq", "pct", "c_pct", "prob_delay", "1_in_n_delay"]
 
     # Check the values
-    assert list(result_df["beds"]) == expected_beds
-    assert list(result_df["freq"]) == expected_freq
+    assert np.array_equal(result_df["beds"], expected_beds)
+    assert np.array_equal(result_df["freq"], expected_freq)
     assert np.allclose(result_df["pct"], expected_pct)
     assert np.allclose(result_df["c_pct"], expected_c_pct)
 
@@ -194,6 +241,21 @@ def test_get_occupancy_freq():
 # SimLogger
 # -----------------------------------------------------------------------------
 
+@pytest.fixture(name="reset_logger")
+def fixture_reset_logger():
+    """
+    Fixture: after the test, removes and closes the handlers that SimLogger
+    added, so that no log file is left open and the next test starts with a
+    logger that has no handlers.
+    """
+    yield
+    logger = logging.getLogger("simulation.logging")
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+        handler.close()
+
+
+@pytest.mark.usefixtures("reset_logger")
 def test_log_to_console():
     """
     Confirm that logger.log() prints the provided message to the console.
@@ -209,28 +271,61 @@ def test_log_to_console():
         assert "Test console log" in mock_stdout.getvalue()
 
 
-def test_log_to_file():
+@pytest.mark.usefixtures("reset_logger")
+def test_log_to_file(tmp_path):
     """
-    Confirm that logger.log() would output the message to a .log file at the
+    Confirm that logger.log() outputs the message to a .log file at the
     provided file path.
 
+    Parameters
+    ----------
+    tmp_path: pathlib.Path
+        Temporary directory unique to this test (pytest fixture).
+
     Notes
     -----
-    Test from github.com/pythonhealthdatascience/pydesrap_mms.
+    Adapted from github.com/pythonhealthdatascience/pydesrap_mms. This writes
+    to a real file in a temporary directory, rather than patching
+    `builtins.open` (which would intercept every file opened during the
+    test).
     """
-    # Mock the file open operation
-    with patch('builtins.open', new_callable=MagicMock) as mock_open:
-        # Create the logger and log a simple example
-        logger = SimLogger(log_to_file=True, file_path="test.log")
-        logger.log(sim_time=None, msg="Log message")
+    # Create the logger and log a simple example
+    log_path = tmp_path / "test.log"
+    logger = SimLogger(log_to_file=True, file_path=str(log_path))
+    logger.log(sim_time=None, msg="Log message")
 
-        # Check that the file was opened in write mode at the absolute path
-        mock_open.assert_called_with(
-            os.path.abspath("test.log"), "w", encoding="locale", errors=None)
+    # Verify a FileHandler is attached to the logger, writing to the path
+    file_handlers = [handler for handler in logger.logger.handlers
+                     if isinstance(handler, logging.FileHandler)]
+    assert [handler.baseFilename for handler in file_handlers] == [
+        str(log_path)]
+
+    # Check that the message was written to the file
+    assert log_path.read_text(encoding="utf-8") == "Log message\n"
+
+
+@pytest.mark.usefixtures("reset_logger")
+def test_log_model_sanitised(tmp_path):
+    """
+    Check that, with sanitise enabled, the log of the model's attributes
+    at initialisation contains no memory addresses, and doesn't repeat the
+    samplers via los_sampler.
+
+    Parameters
+    ----------
+    tmp_path: pathlib.Path
+        Temporary directory unique to this test (pytest fixture).
+    """
+    log_path = tmp_path / "model.log"
+    param = Param(warm_up_period=0, data_collection_period=1,
+                  log_to_file=True, log_file_path=str(log_path))
+    param.logger.sanitise = True
+    Model(param, run_number=0).run()
 
-        # Verify a FileHandler is attached to the logger
-        assert (any(isinstance(handler, logging.FileHandler)
-                    for handler in logger.logger.handlers))
+    log = log_path.read_text(encoding="utf-8")
+    assert "Initialise model" in log
+    assert " at 0x" not in log
+    assert "los_sampler" not in log
 
 
 def test_invalid_path():
@@ -263,3 +358,98 @@ def test_lockeddict_attribute():
         ld.a = 99
 
     assert "Cannot set attribute" in str(e) and "Use item syntax" in str(e)
+
+
+def test_lockeddict_new_key_message():
+    """
+    Adding a new key should raise a KeyError which names the key and lists
+    the allowed keys, including after pickling.
+    """
+    ld = LockedDict({"a": 1, "b": 2})
+
+    with pytest.raises(KeyError) as exc_info:
+        ld["c"] = 3
+
+    for error in [exc_info.value, pickle.loads(pickle.dumps(exc_info.value))]:
+        assert "Attempted to add or update key 'c'" in str(error)
+        assert "['a', 'b']" in str(error)
+
+
+def test_lockeddict_delete_key_message():
+    """
+    Deleting a key should raise a KeyError which names the key and lists the
+    allowed keys.
+    """
+    ld = LockedDict({"a": 1, "b": 2})
+
+    with pytest.raises(KeyError) as exc_info:
+        del ld["a"]
+
+    assert "Deletion of key 'a' is not allowed" in str(exc_info.value)
+    assert "['a', 'b']" in str(exc_info.value)
+    assert ld == {"a": 1, "b": 2}
+
+
+# -----------------------------------------------------------------------------
+# Samplers
+# -----------------------------------------------------------------------------
+
+def test_discrete_sampler_matches_distribution():
+    """
+    DiscreteSampler should return the same values, of the same type, as
+    sampling from the DiscreteEmpirical distribution it wraps.
+    """
+    values = ["rehab", "esd", "other"]
+    freq = [0.24, 0.13, 0.63]
+    dist = DiscreteEmpirical(values=values, freq=freq, random_seed=42)
+    sampler = DiscreteSampler(
+        DiscreteEmpirical(values=values, freq=freq, random_seed=42))
+
+    expected = [dist.sample() for _ in range(1000)]
+    samples = [sampler.sample() for _ in range(1000)]
+
+    assert samples == expected
+    assert all(isinstance(sample, str) for sample in samples)
+
+
+def test_discrete_sampler_batch():
+    """
+    Drawing a batch of samples from DiscreteSampler should give the same
+    values as drawing them one at a time, and as DiscreteEmpirical.
+    """
+    values = ["esd", "other"]
+    freq = [0.05, 0.95]
+    dist = DiscreteEmpirical(values=values, freq=freq, random_seed=7)
+    sampler_single = DiscreteSampler(
+        DiscreteEmpirical(values=values, freq=freq, random_seed=7))
+    sampler_batch = DiscreteSampler(
+        DiscreteEmpirical(values=values, freq=freq, random_seed=7))
+
+    expected = dist.sample(size=500)
+    single = [sampler_single.sample() for _ in range(500)]
+    batch = sampler_batch.sample(size=500)
+
+    assert np.array_equal(batch, expected)
+    assert batch.tolist() == single
+
+
+@pytest.mark.parametrize("dist_class, kwargs", [
+    (Exponential, {"mean": 3.2}),
+    (Lognormal, {"mean": 7.4, "stdev": 8.61}),
+    (DiscreteEmpirical, {"values": ["esd", "other"], "freq": [0.4, 0.6]})
+])
+def test_buffered_sampler_matches_distribution(dist_class, kwargs):
+    """
+    BufferedSampler should return the same values, as Python scalars, as
+    sampling one at a time from the distribution it wraps - including
+    across refills of the buffer.
+    """
+    dist = dist_class(**kwargs, random_seed=5)
+    sampler = BufferedSampler(dist_class(**kwargs, random_seed=5),
+                              block_size=16)
+
+    expected = [dist.sample() for _ in range(100)]
+    samples = [sampler.sample() for _ in range(100)]
+
+    assert samples == expected
+    assert all(type(sample) is type(expected[0]) for sample in samples)